@@ -1,7 +1,9 @@
+import hmac
 import jwt
 import logging
 from functools import wraps
 from flask import request, jsonify, current_app
+from werkzeug.exceptions import HTTPException
 
 def token_required(f):
     """
@@ -28,6 +30,9 @@ def token_required(f):
             if not current_user:
                 return jsonify({'message': 'User not found!'}), 401
             
+        except HTTPException:
+            # e.g. the user store is saturated; let the app's error handlers answer
+            raise
         except Exception as e:
             logging.error(f"Token validation error: {e}")
             return jsonify({'message': 'Token is invalid!'}), 401
@@ -35,6 +40,20 @@ def token_required(f):
         return f(current_user, data, *args, **kwargs)
     return decorated
 
+def admin_token_required(f):
+    """
+    Decorator to restrict operational routes to callers sending X-Admin-Token
+    matching ADMIN_TOKEN. The routes are disabled while ADMIN_TOKEN is unset.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        expected = current_app.config['ADMIN_TOKEN']
+        provided = request.headers.get('X-Admin-Token')
+        if not (expected and provided and hmac.compare_digest(expected, provided)):
+            return jsonify({'message': 'Admin token is missing or invalid.'}), 403
+        return f(*args, **kwargs)
+    return decorated
+
 def user_identity_required(f):
     """
     Decorator to verify that the user from the token matches the user_id in the URL.
@@ -0,0 +1,87 @@
+"""
+Benchmark for the events response layer (middleware/http_cache.py).
+
+Serves a synthetic /events/search payload from a throwaway Flask app, once
+through a plain view and once through cached_response, and reports bytes on
+the wire and server CPU per request for three client behaviours:
+
+    first fetch     - no Accept-Encoding, no validator
+    gzip fetch      - Accept-Encoding: gzip, no validator
+    revalidation    - repeat request carrying If-None-Match
+
+Run from the repository root:
+    python app/benchmarks/bench_http_cache.py [--hits 20] [--requests 2000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from flask import Flask, jsonify  # noqa: E402
+from app.middleware.http_cache import cached_response  # noqa: E402
+
+
+def make_payload(hits):
+    events = [{
+        "id": f"19hz-{i}",
+        "name": f"Warehouse Night {i}: Artist {i}, Artist {i + 1} b2b Artist {i + 2}",
+        "artists": [f"Artist {i}", f"Artist {i + 1}", f"Artist {i + 2}"],
+        "venue": f"Venue {i % 17}",
+        "city": ["Oakland", "Los Angeles", "Seattle", "Chicago"][i % 4],
+        "country": "United States",
+        "date": f"2025-08-{1 + i % 28:02d}T22:00:00Z",
+    } for i in range(hits)]
+    return {"hits": events, "query": "techno", "processingTimeMs": 3, "limit": hits, "offset": 0,
+            "estimatedTotalHits": hits}
+
+
+def build_app(payload):
+    app = Flask(__name__)
+
+    @app.route("/plain")
+    def plain():
+        return jsonify(payload), 200
+
+    @app.route("/cached")
+    @cached_response(lambda: "2025-08-01T00:00:00Z", lambda: 3600)
+    def cached():
+        return jsonify(payload), 200
+
+    return app
+
+
+def measure(client, path, headers, requests):
+    response = client.get(path, headers=headers)
+    start = time.process_time()
+    for _ in range(requests):
+        response = client.get(path, headers=headers)
+    cpu_us = (time.process_time() - start) / requests * 1e6
+    return response, cpu_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hits", type=int, default=20, help="Events per search response")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario")
+    args = parser.parse_args()
+
+    client = build_app(make_payload(args.hits)).test_client()
+    etag = client.get("/cached").headers["ETag"]
+
+    scenarios = [
+        ("first fetch", {}),
+        ("gzip fetch", {"Accept-Encoding": "gzip"}),
+        ("revalidation", {"Accept-Encoding": "gzip", "If-None-Match": etag}),
+    ]
+
+    print(f"{'scenario':<14} {'mode':<8} {'status':>6} {'body bytes':>11} {'cpu us/req':>11}")
+    for name, headers in scenarios:
+        for mode in ("plain", "cached"):
+            response, cpu_us = measure(client, f"/{mode}", headers, args.requests)
+            print(f"{name:<14} {mode:<8} {response.status_code:>6} {len(response.get_data()):>11} {cpu_us:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
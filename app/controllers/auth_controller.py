@@ -2,15 +2,19 @@ import jwt
 import random
 from datetime import datetime, timedelta
 from flask import jsonify, request
-from twilio.rest import Client
 from decimal import Decimal
+from services.clients import DependencyBusy, dependency_slot, twilio_client, TWILIO_MAX_CONNECTIONS
 
 class AuthController:
     def __init__(self, app, user_service):
         self.app = app
         self.user_service = user_service
         self.logger = app.logger
-        self.twilio_client = Client(app.config['TWILIO_ACCOUNT_SID'], app.config['TWILIO_AUTH_TOKEN'])
+
+    @property
+    def twilio_client(self):
+        # Only built (and twilio only imported) the first time an SMS is actually sent
+        return twilio_client(self.app.config['TWILIO_ACCOUNT_SID'], self.app.config['TWILIO_AUTH_TOKEN'])
 
     def _generate_otp(self):
         return str(random.randint(100000, 999999))
@@ -57,12 +61,15 @@ class AuthController:
         if self.app.config['TWILIO_ACTIVE']:
             try:
                 self.logger.info(f"Attempting to send OTP via Twilio to {phone_number}")
-                message = self.twilio_client.messages.create(
-                    to=phone_number,
-                    from_=self.app.config['TWILIO_PHONE_NUMBER'],
-                    body=f"Your login code is: {otp}"
-                )
+                with dependency_slot('Twilio', TWILIO_MAX_CONNECTIONS):
+                    message = self.twilio_client.messages.create(
+                        to=phone_number,
+                        from_=self.app.config['TWILIO_PHONE_NUMBER'],
+                        body=f"Your login code is: {otp}"
+                    )
                 self.logger.info(f"Successfully sent OTP to {phone_number}. Message SID: {message.sid}")
+            except DependencyBusy:
+                raise
             except Exception as e:
                 self.logger.error(f"Twilio failed to send OTP to {phone_number}: {e}")
                 return jsonify({"error": "Failed to send OTP."}), 500
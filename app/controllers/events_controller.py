@@ -1,7 +1,22 @@
 import os
 import logging
-import meilisearch
-from flask import jsonify, request
+import math
+import threading
+import time
+from datetime import date, timedelta
+from flask import g, has_request_context, jsonify, request
+from src.suggest_index import MAX_SUGGESTIONS
+from services.clients import DependencyBusy, get_client, meilisearch_search_client
+
+DEFAULT_UPCOMING_DAYS = 7
+DEFAULT_UPCOMING_LIMIT = 20
+MAX_UPCOMING_LIMIT = 100
+# How long a worker trusts its cached view of the events index generation
+GENERATION_TTL_SECONDS = 30
+# After a failed check, how long a worker waits before asking Meilisearch again
+GENERATION_RETRY_SECONDS = 5
+# Marks indexes this worker built itself during a refresh or expiry
+_LOCAL_BUILD = object()
 
 class EventsController:
     """Controller for events-related endpoints with Meilisearch integration."""
@@ -10,7 +25,109 @@ class EventsController:
         # Meilisearch client setup
         self.meili_url = os.getenv("MEILI_URL", "http://18.217.93.15:7700")
         self.meili_api_key = os.getenv("MEILI_API_KEY")
-        self.client = meilisearch.Client(self.meili_url, self.meili_api_key)
+
+        # In-process indexes rebuilt on every refresh. Workers that have not run a
+        # refresh themselves load the current corpus from Meilisearch on first use,
+        # and reload it whenever the index generation moves on.
+        self.indexes = None
+        self._indexes_generation = None
+        self._indexes_lock = threading.Lock()
+
+        # Identifies the current contents of the events index, for ETags
+        self._generation = None
+        self._generation_error = None
+        self._generation_checked_at = None
+
+    @property
+    def client(self):
+        # Created on first request so importing the app stays cheap and fork-safe
+        def factory():
+            import meilisearch
+            return meilisearch.Client(self.meili_url, self.meili_api_key)
+        return get_client(('meilisearch', self.meili_url), factory)
+
+    @property
+    def search_client(self):
+        # Pooled keep-alive client with a timeout, used on the per-request search path
+        return meilisearch_search_client(self.meili_url, self.meili_api_key)
+
+    def index_generation(self):
+        """
+        Identifier that changes whenever the events index changes. Taken from the
+        index's updatedAt so every worker agrees, and cached briefly to keep it
+        off the request path. Read through the pooled client, so the check is
+        bounded by its timeout and Meilisearch's connection slots.
+
+        Within a request the first answer (or error) is reused, so the ETag and
+        the in-process indexes agree and a request never checks twice.
+        """
+        if not has_request_context():
+            return self._check_generation()
+        if 'events_generation' not in g:
+            try:
+                g.events_generation = (self._check_generation(), None)
+            except Exception as e:
+                g.events_generation = (None, e)
+        generation, error = g.events_generation
+        if error is not None:
+            raise error
+        return generation
+
+    def _check_generation(self):
+        now = time.monotonic()
+        ttl = GENERATION_TTL_SECONDS if self._generation_error is None else GENERATION_RETRY_SECONDS
+        if self._generation_checked_at is None or now - self._generation_checked_at > ttl:
+            try:
+                info = self.search_client.index_info("events")
+                self._generation, self._generation_error = info.get("updatedAt"), None
+            except Exception as e:
+                # Back off, so an outage does not put a Meilisearch call on every request
+                logging.warning(f"Events index generation check failed: {e}")
+                self._generation_error = str(e)
+            self._generation_checked_at = now
+        if self._generation_error is not None:
+            raise RuntimeError(f"Events index generation unavailable: {self._generation_error}")
+        return self._generation
+
+    def _invalidate_generation(self):
+        self._generation_checked_at = None
+
+    def _set_local_indexes(self, indexes, complete=True):
+        # Indexes built in this worker from the full corpus it just wrote to
+        # Meilisearch are adopted for whichever generation is seen next. Partial
+        # ones (an incremental refresh only sees the events it scraped) serve
+        # until the next generation check reloads the whole corpus.
+        self.indexes = indexes
+        self._indexes_generation = _LOCAL_BUILD if complete else None
+
+    def _ensure_indexes(self):
+        try:
+            generation = self.index_generation()
+        except Exception as e:
+            if self.indexes is None:
+                raise
+            logging.warning(f"Could not check events index generation, serving current indexes: {e}")
+            return self.indexes
+
+        if self.indexes is not None:
+            if self._indexes_generation is _LOCAL_BUILD:
+                self._indexes_generation = generation
+            if self._indexes_generation == generation:
+                return self.indexes
+
+        # One request reloads; the others keep serving the previous indexes meanwhile
+        if not self._indexes_lock.acquire(blocking=self.indexes is None):
+            return self.indexes
+        try:
+            if self.indexes is None or self._indexes_generation != generation:
+                from src.orchestrator import build_event_indexes
+                from src.meilisearch_client import fetch_all_events
+                self.indexes = build_event_indexes(fetch_all_events(self.client))
+                self._indexes_generation = generation
+                logging.info(f"Loaded event indexes for generation {generation}")
+        finally:
+            self._indexes_lock.release()
+        return self.indexes
     
     def health(self):
         """Health check endpoint for Meilisearch."""
@@ -33,20 +150,95 @@ class EventsController:
             return jsonify({"error": "Missing query parameter 'q'"}), 400
 
         try:
-            index = self.client.index("events")
-            results = index.search(query)
+            results = self.search_client.search("events", query)
             return jsonify(results), 200
+        except DependencyBusy:
+            raise
         except Exception as e:
             logging.error(f"Search failed: {e}")
             return jsonify({"error": str(e)}), 500
 
+    def suggest(self):
+        """Typeahead suggestions for artists, venues and cities."""
+        prefix = request.args.get("prefix", "")
+        if not prefix.strip():
+            return jsonify({"error": "Missing query parameter 'prefix'"}), 400
+
+        try:
+            limit = int(request.args.get("limit", MAX_SUGGESTIONS))
+        except ValueError:
+            return jsonify({"error": "Query parameter 'limit' must be an integer"}), 400
+
+        try:
+            indexes = self._ensure_indexes()
+        except Exception as e:
+            logging.error(f"Failed to load event indexes: {e}")
+            return jsonify({"error": str(e)}), 503
+
+        suggestions = indexes["suggest"].suggest(prefix, max(limit, 1))
+        return jsonify({"prefix": prefix, "suggestions": suggestions}), 200
+
+    def upcoming_cache_key(self):
+        # Without 'from' the window starts today, so cached responses must roll over daily
+        return date.today().isoformat()
+
+    def upcoming(self):
+        """List events in a city over a date window, ordered by date."""
+        city = request.args.get("city")
+        if not city:
+            return jsonify({"error": "Missing query parameter 'city'"}), 400
+
+        try:
+            start = date.fromisoformat(request.args["from"]) if request.args.get("from") else date.today()
+            end = (date.fromisoformat(request.args["to"]) if request.args.get("to")
+                   else start + timedelta(days=DEFAULT_UPCOMING_DAYS))
+        except ValueError:
+            return jsonify({"error": "Query parameters 'from' and 'to' must be dates (YYYY-MM-DD)"}), 400
+
+        try:
+            limit = int(request.args.get("limit", DEFAULT_UPCOMING_LIMIT))
+        except ValueError:
+            return jsonify({"error": "Query parameter 'limit' must be an integer"}), 400
+        limit = min(max(limit, 1), MAX_UPCOMING_LIMIT)
+
+        try:
+            indexes = self._ensure_indexes()
+        except Exception as e:
+            logging.error(f"Failed to load event indexes: {e}")
+            return jsonify({"error": str(e)}), 503
+
+        try:
+            # 'to' is inclusive, so the exclusive bound is the following day
+            events, next_cursor = indexes["upcoming"].range(
+                city, start.isoformat(), (end + timedelta(days=1)).isoformat(),
+                limit, request.args.get("cursor"))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        return jsonify({
+            "city": city,
+            "from": start.isoformat(),
+            "to": end.isoformat(),
+            "events": events,
+            "next_cursor": next_cursor
+        }), 200
+
     def refresh(self):
-        """Refresh events by scraping all cities and saving to Meilisearch."""
+        """
+        Refresh events by scraping all cities and saving to Meilisearch.
+
+        ?mode=full rebuilds the index from scratch through a shadow index and an
+        atomic swap; the default mode adds/updates documents in place.
+        """
+        mode = request.args.get("mode", "incremental")
+        if mode not in ("incremental", "full"):
+            return jsonify({"error": "Query parameter 'mode' must be 'incremental' or 'full'"}), 400
+
         try:
             # Import the orchestrator (with error handling)
             try:
-                from src.orchestrator import refresh_all_events
-                from src.meilisearch_client import save_events_to_meilisearch
+                from src.orchestrator import refresh_all_events, expire_past_events
+                from src.meilisearch_client import save_events_to_meilisearch, rebuild_events_index
             except ImportError as e:
                 return jsonify({"error": f"Missing required modules: {str(e)}"}), 500
             
@@ -56,16 +248,37 @@ class EventsController:
             stats = result["stats"]
             
             # Save to Meilisearch
-            success = save_events_to_meilisearch(events, self.client)
+            if mode == "full" and stats["cities_failed"]:
+                # A full rebuild replaces the index, so a missing city would vanish from it
+                return jsonify({
+                    "error": "Full rebuild skipped because some cities failed to scrape",
+                    **stats
+                }), 502
+            if mode == "full":
+                success = rebuild_events_index(events, self.client)
+            else:
+                success = save_events_to_meilisearch(events, self.client)
             
             if not success:
                 return jsonify({
                     "error": "Failed to save to Meilisearch",
                     **stats
                 }), 500
+
+            self._set_local_indexes(result["indexes"], complete=mode == "full")
+            self._invalidate_generation()
+
+            # Drop events from earlier refreshes that have since passed
+            try:
+                expiry = expire_past_events(self.client)
+            except Exception as e:
+                logging.error(f"Failed to expire past events: {e}")
+                expiry = {"error": str(e)}
             
             return jsonify({
                 "status": "success",
+                "mode": mode,
+                "expiry": expiry,
                 **stats
             }), 200
             
@@ -73,5 +286,34 @@ class EventsController:
             logging.error(f"Error in events refresh: {e}")
             return jsonify({"error": str(e)}), 500
 
+    def expire(self):
+        """
+        Delete events older than the retention window from Meilisearch and the
+        in-process indexes. ?dry_run=true only reports what would be deleted.
+        """
+        dry_run = request.args.get("dry_run", "false").lower() in ("true", "1", "t")
+        try:
+            retention_days = float(request.args["retention_days"]) if "retention_days" in request.args else None
+        except ValueError:
+            retention_days = math.nan
+        # A negative window would put the cutoff in the future and expire everything
+        if retention_days is not None and not (math.isfinite(retention_days) and retention_days >= 0):
+            return jsonify({"error": "Query parameter 'retention_days' must be a non-negative number"}), 400
+
+        try:
+            from src.orchestrator import expire_past_events, expiry_cutoff, prune_event_indexes
+            cutoff = expiry_cutoff(retention_days) if retention_days is not None else expiry_cutoff()
+            report = expire_past_events(self.client, dry_run=dry_run, cutoff=cutoff)
+        except Exception as e:
+            logging.error(f"Error expiring past events: {e}")
+            return jsonify({"error": str(e)}), 500
+
+        if not dry_run:
+            self._invalidate_generation()
+            if self.indexes is not None:
+                self._set_local_indexes(prune_event_indexes(self.indexes, cutoff),
+                                        complete=self._indexes_generation is not None)
+        return jsonify(report), 200
+
 # Create a global instance to use in routes
 events_controller = EventsController() 
\ No newline at end of file
@@ -0,0 +1,32 @@
+from flask import jsonify
+
+class LikesController:
+    def __init__(self, app, like_service):
+        self.app = app
+        self.like_service = like_service
+        self.logger = app.logger
+
+    def like(self, target_type, target_id, current_user):
+        # Check the target exists first so likes are never recorded against nothing.
+        # Recently liked items are answered from memory, so a hot item is not read per like.
+        like_count = self.like_service.get_like_count(target_type, target_id)
+        if like_count is None:
+            return jsonify({'message': f'{target_type.capitalize()} not found'}), 404
+
+        liked = self.like_service.like(target_type, target_id, current_user['user_id'])
+        if liked is None:
+            return jsonify({'error': f'Failed to like {target_type}.'}), 500
+        return jsonify({'liked': True, 'like_count': like_count + (1 if liked else 0)})
+
+    def unlike(self, target_type, target_id, current_user):
+        like_count = self.like_service.get_like_count(target_type, target_id)
+        if like_count is None:
+            return jsonify({'message': f'{target_type.capitalize()} not found'}), 404
+
+        unliked = self.like_service.unlike(target_type, target_id, current_user['user_id'])
+        if unliked is None:
+            return jsonify({'error': f'Failed to unlike {target_type}.'}), 500
+        return jsonify({'liked': False, 'like_count': like_count - (1 if unliked else 0)})
+
+def initialize_likes_controller(app, like_service):
+    return LikesController(app, like_service)
@@ -0,0 +1,119 @@
+import base64
+import json
+from decimal import Decimal
+from flask import jsonify, request
+
+DEFAULT_PAGE_SIZE = 20
+# Keeps a page's author lookup within a single BatchGetItem call
+MAX_PAGE_SIZE = 100
+
+def _encode_cursor(last_evaluated_key):
+    if not last_evaluated_key:
+        return None
+    return base64.urlsafe_b64encode(json.dumps(last_evaluated_key, sort_keys=True).encode()).decode()
+
+def _decode_cursor(cursor, key_name, key_value):
+    # A cursor must be exactly the LastEvaluatedKey of this query: the table key
+    # plus the index key, with the index key matching the requested id
+    key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    if not isinstance(key, dict) or set(key) != {'post_id', key_name}:
+        raise ValueError("cursor is not a key of this query")
+    if not all(isinstance(v, str) for v in key.values()) or key[key_name] != key_value:
+        raise ValueError("cursor is not a key of this query")
+    return key
+
+def _plain(value):
+    # DynamoDB returns numbers as Decimal, which jsonify cannot serialize
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    return value
+
+class PostsController:
+    def __init__(self, app, post_service, user_service, like_service):
+        self.app = app
+        self.post_service = post_service
+        self.user_service = user_service
+        self.like_service = like_service
+        self.logger = app.logger
+
+    def _serialize_posts(self, posts):
+        # One batched read hydrates every author on the page
+        authors = self.user_service.find_users_by_ids([post.get('user_id') for post in posts])
+        serialized = []
+        for post in posts:
+            author = authors.get(post.get('user_id'))
+            serialized.append({
+                **_plain(post),
+                'like_count': self.like_service.like_count('post', post),
+                'author': {'userId': author['user_id'], 'name': author.get('name')} if author else None
+            })
+        return serialized
+
+    def list_posts(self):
+        event_id = request.args.get('event_id')
+        user_id = request.args.get('user_id')
+        if bool(event_id) == bool(user_id):
+            return jsonify({'error': "Exactly one of 'event_id' or 'user_id' is required"}), 400
+
+        try:
+            limit = min(max(int(request.args.get('limit', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        except ValueError:
+            return jsonify({'error': "Query parameter 'limit' must be an integer"}), 400
+
+        start_key = None
+        cursor = request.args.get('cursor')
+        if cursor:
+            try:
+                if event_id:
+                    start_key = _decode_cursor(cursor, 'event_id', event_id)
+                else:
+                    start_key = _decode_cursor(cursor, 'user_id', user_id)
+            except Exception:
+                return jsonify({'error': 'Invalid cursor'}), 400
+
+        if event_id:
+            result = self.post_service.find_posts_by_event_id(event_id, limit, start_key)
+        else:
+            result = self.post_service.find_posts_by_user_id(user_id, limit, start_key)
+        if result is None:
+            return jsonify({'error': 'Failed to load posts.'}), 500
+
+        posts, last_evaluated_key = result
+        return jsonify({
+            'posts': self._serialize_posts(posts),
+            'next_cursor': _encode_cursor(last_evaluated_key)
+        })
+
+    def get_post(self, post_id):
+        post = self.post_service.find_post_by_id(post_id)
+        if not post:
+            return jsonify({'message': 'Post not found'}), 404
+        return jsonify(self._serialize_posts([post])[0])
+
+    def create_post(self, current_user):
+        data = request.get_json() or {}
+        event_id = data.get('event_id')
+        if not event_id:
+            return jsonify({'error': 'event_id is required'}), 400
+
+        photo_urls = data.get('photo_urls', [])
+        if not isinstance(photo_urls, list):
+            return jsonify({'error': 'photo_urls must be a list'}), 400
+
+        post = self.post_service.create_post(
+            current_user['user_id'],
+            event_id,
+            data.get('header_text', ''),
+            data.get('body_text', ''),
+            photo_urls
+        )
+        if not post:
+            return jsonify({'error': 'Failed to create post.'}), 500
+        return jsonify(self._serialize_posts([post])[0]), 201
+
+def initialize_posts_controller(app, post_service, user_service, like_service):
+    return PostsController(app, post_service, user_service, like_service)
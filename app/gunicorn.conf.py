@@ -0,0 +1,23 @@
+import os
+
+# Serving mode, selected with SERVER_MODE:
+#   sync  (default) - gunicorn's sync workers, one request per worker at a time
+#   async           - gevent workers; requests yield while waiting on Meilisearch,
+#                     DynamoDB or Twilio, so one worker holds many in flight.
+#                     Connection limits per dependency live in services/clients.py.
+server_mode = os.environ.get('SERVER_MODE', 'sync').lower()
+
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', '1'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+preload_app = True
+
+if server_mode == 'async':
+    # Patch before the app is preloaded so every lock and socket it creates is cooperative
+    from gevent import monkey
+    monkey.patch_all()
+
+    worker_class = 'gevent'
+    worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', '1000'))
+else:
+    worker_class = 'sync'
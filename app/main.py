@@ -1,11 +1,15 @@
 import os
 import sys
 import logging
-import watchtower
-import boto3
+from datetime import datetime, timedelta
 from flask import Flask, request, jsonify
 from werkzeug.security import generate_password_hash
-from app.auth.decorators import token_required, user_identity_required
+from app.auth.decorators import admin_token_required, token_required, user_identity_required
+from app.middleware.http_cache import cached_response
+from app.middleware.profiling import init_profiling
+from app.middleware.admission import (
+    ConcurrencyLimiter, TokenBucketLimiter, admission_controlled, rate_limited, client_ip
+)
 
 # Add the current directory to Python path so we can import modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -15,7 +19,12 @@ from controllers.home_controller import get_home
 from controllers.events_controller import events_controller
 from controllers.users_controller import initialize_users_controller
 from controllers.auth_controller import initialize_auth_controller
+from controllers.posts_controller import initialize_posts_controller
+from controllers.likes_controller import initialize_likes_controller
 from services.user_service import initialize_user_service
+from services.post_service import initialize_post_service
+from services.like_service import initialize_like_service
+from services.clients import DependencyBusy
 
 
 app = Flask(__name__)
@@ -32,35 +41,110 @@ app.config['AWS_REGION'] = os.environ.get('AWS_REGION', 'us-east-2')
 # Feature Flags
 app.config['TWILIO_ACTIVE'] = os.environ.get('TWILIO_ACTIVE', 'false').lower() in ('true', '1', 't')
 
+# Operational routes such as /events/expire require X-Admin-Token to match this
+app.config['ADMIN_TOKEN'] = os.environ.get('ADMIN_TOKEN')
+
+# Events are re-scraped on this schedule, so cached responses live at most this long
+app.config['EVENTS_REFRESH_INTERVAL_SECONDS'] = int(os.environ.get('EVENTS_REFRESH_INTERVAL_SECONDS', '3600'))
+
+# Likes
+app.config['LIKE_FLUSH_INTERVAL_SECONDS'] = float(os.environ.get('LIKE_FLUSH_INTERVAL_SECONDS', '5'))
+
+# On-demand request profiling (off unless PROFILING_ENABLED is set)
+app.config['PROFILING_ENABLED'] = os.environ.get('PROFILING_ENABLED', 'false').lower() in ('true', '1', 't')
+app.config['PROFILING_TOKEN'] = os.environ.get('PROFILING_TOKEN')
+app.config['PROFILING_SAMPLE_RATE'] = float(os.environ.get('PROFILING_SAMPLE_RATE', '0'))
+app.config['PROFILING_DIR'] = os.environ.get('PROFILING_DIR', '/tmp/kilograms-profiles')
+app.config['PROFILING_MAX_FILES'] = int(os.environ.get('PROFILING_MAX_FILES', '200'))
+
+# Admission control: concurrent requests per route, how many may wait, and for how long
+app.config['SEARCH_MAX_CONCURRENT'] = int(os.environ.get('SEARCH_MAX_CONCURRENT', '32'))
+app.config['SEARCH_MAX_QUEUE'] = int(os.environ.get('SEARCH_MAX_QUEUE', '64'))
+app.config['OTP_SEND_MAX_CONCURRENT'] = int(os.environ.get('OTP_SEND_MAX_CONCURRENT', '8'))
+app.config['OTP_SEND_MAX_QUEUE'] = int(os.environ.get('OTP_SEND_MAX_QUEUE', '16'))
+app.config['ADMISSION_QUEUE_TIMEOUT_SECONDS'] = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT_SECONDS', '1'))
+# Requests that already waited this long in front of the app are shed on arrival
+app.config['MAX_QUEUE_AGE_SECONDS'] = float(os.environ.get('MAX_QUEUE_AGE_SECONDS', '5'))
+# OTP sends per client IP and per phone number: burst size, then one every N seconds
+app.config['OTP_IP_BURST'] = int(os.environ.get('OTP_IP_BURST', '5'))
+app.config['OTP_IP_INTERVAL_SECONDS'] = float(os.environ.get('OTP_IP_INTERVAL_SECONDS', '60'))
+app.config['OTP_PHONE_BURST'] = int(os.environ.get('OTP_PHONE_BURST', '3'))
+app.config['OTP_PHONE_INTERVAL_SECONDS'] = float(os.environ.get('OTP_PHONE_INTERVAL_SECONDS', '300'))
+
+queue_timeout = app.config['ADMISSION_QUEUE_TIMEOUT_SECONDS']
+max_queue_age = app.config['MAX_QUEUE_AGE_SECONDS']
+search_limiter = ConcurrencyLimiter(
+    'search', app.config['SEARCH_MAX_CONCURRENT'], app.config['SEARCH_MAX_QUEUE'], queue_timeout)
+otp_send_limiter = ConcurrencyLimiter(
+    'otp send', app.config['OTP_SEND_MAX_CONCURRENT'], app.config['OTP_SEND_MAX_QUEUE'], queue_timeout)
+# A refresh scrapes every city; never run more than one at a time per worker
+refresh_limiter = ConcurrencyLimiter('refresh', 1, 0, 0)
+otp_ip_bucket = TokenBucketLimiter(1 / app.config['OTP_IP_INTERVAL_SECONDS'], app.config['OTP_IP_BURST'])
+otp_phone_bucket = TokenBucketLimiter(1 / app.config['OTP_PHONE_INTERVAL_SECONDS'], app.config['OTP_PHONE_BURST'])
+
+def otp_phone_number():
+    data = request.get_json(silent=True) or {}
+    digits = ''.join(c for c in str(data.get('phoneNumber') or '') if c.isdigit())
+    # Bucket "5551234567" and "+15551234567" together, as send_otp does
+    return f"1{digits}" if len(digits) == 10 else digits or None
+
 
 # Initialize services
 user_service = initialize_user_service(app)
+post_service = initialize_post_service(app)
+like_service = initialize_like_service(app)
 
 # Initialize controllers
 # Note: users_controller may need to be updated to use user_service as well,
 # but for now we leave it as is to focus on the auth flow.
 users_controller = initialize_users_controller(app, {}) # Passing empty dict as in-memory store is no longer used
 auth_controller = initialize_auth_controller(app, user_service)
+posts_controller = initialize_posts_controller(app, post_service, user_service, like_service)
+likes_controller = initialize_likes_controller(app, like_service)
 
 # Attach user_service to the app context so decorators can access it
 app.user_service = user_service
 
+init_profiling(app)
+
 # Set up logging
-if os.environ.get('FLASK_ENV') == 'production':
+def setup_cloudwatch_logging():
+    # Imported here so development and CI never pay for the CloudWatch handler
+    import boto3
+    import watchtower
     boto3_client = boto3.client("logs", region_name="us-east-2")
     handler = watchtower.CloudWatchLogHandler(boto3_client=boto3_client, log_group_name=app.name)
-    app.logger.addHandler(handler)
-    logging.getLogger("werkzeug").addHandler(handler)
+    for logger in (app.logger, logging.getLogger("werkzeug")):
+        # Drop a handler inherited from a preloading master; its sender thread did not survive the fork
+        for old in [h for h in logger.handlers if isinstance(h, watchtower.CloudWatchLogHandler)]:
+            logger.removeHandler(old)
+        logger.addHandler(handler)
+
+if os.environ.get('FLASK_ENV') == 'production':
+    setup_cloudwatch_logging()
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=setup_cloudwatch_logging)
     logging.basicConfig(level=logging.INFO)
 else:
     logging.basicConfig(level=logging.INFO)
 
+@app.errorhandler(DependencyBusy)
+def dependency_busy(e):
+    app.logger.warning(f"Shedding request: {e.description}")
+    response = jsonify({'error': e.description})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response
+
 # Routes
 @app.route("/")
 def home():
     return get_home()
 
 @app.route('/auth/otp/send', methods=['POST'])
+@rate_limited(otp_ip_bucket, client_ip)
+@rate_limited(otp_phone_bucket, otp_phone_number, 'Too many codes requested for this phone number')
+@admission_controlled(otp_send_limiter, max_queue_age)
 def send_otp():
     return auth_controller.send_otp()
 
@@ -84,18 +168,82 @@ def get_user_profile(current_user, token_data, user_id):
 def update_user_profile(current_user, token_data, user_id):
     return users_controller.update_user_profile(user_id)
 
+@app.route('/posts', methods=['GET'])
+@token_required
+def list_posts(current_user, token_data):
+    return posts_controller.list_posts()
+
+@app.route('/posts', methods=['POST'])
+@token_required
+def create_post(current_user, token_data):
+    return posts_controller.create_post(current_user)
+
+@app.route('/posts/<post_id>', methods=['GET'])
+@token_required
+def get_post(current_user, token_data, post_id):
+    return posts_controller.get_post(post_id)
+
+@app.route('/posts/<post_id>/like', methods=['POST'])
+@token_required
+def like_post(current_user, token_data, post_id):
+    return likes_controller.like('post', post_id, current_user)
+
+@app.route('/posts/<post_id>/like', methods=['DELETE'])
+@token_required
+def unlike_post(current_user, token_data, post_id):
+    return likes_controller.unlike('post', post_id, current_user)
+
+@app.route('/comments/<comment_id>/like', methods=['POST'])
+@token_required
+def like_comment(current_user, token_data, comment_id):
+    return likes_controller.like('comment', comment_id, current_user)
+
+@app.route('/comments/<comment_id>/like', methods=['DELETE'])
+@token_required
+def unlike_comment(current_user, token_data, comment_id):
+    return likes_controller.unlike('comment', comment_id, current_user)
+
 @app.route("/events/health")
 def events_health():
     return events_controller.health()
 
+def events_cache_max_age():
+    return app.config['EVENTS_REFRESH_INTERVAL_SECONDS']
+
+def upcoming_cache_max_age():
+    # The default /events/upcoming window moves at midnight; caches must not hold it past then
+    now = datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return min(events_cache_max_age(), (midnight - now).total_seconds())
+
+# Health is never admission-controlled, and cached_response sits outside the
+# limiter so revalidations answered with 304 skip the queue entirely.
 @app.route("/events/search", methods=['GET', 'POST'])
+@cached_response(events_controller.index_generation, events_cache_max_age)
+@admission_controlled(search_limiter, max_queue_age)
 def events_search():
     return events_controller.search()
 
+@app.route("/events/suggest")
+@cached_response(events_controller.index_generation, events_cache_max_age)
+def events_suggest():
+    return events_controller.suggest()
+
+@app.route("/events/upcoming")
+@cached_response(events_controller.index_generation, upcoming_cache_max_age, events_controller.upcoming_cache_key)
+def events_upcoming():
+    return events_controller.upcoming()
+
 @app.route("/events/refresh", methods=['POST'])
+@admission_controlled(refresh_limiter)
 def events_refresh():
     return events_controller.refresh()
 
+@app.route("/events/expire", methods=['POST'])
+@admin_token_required
+def events_expire():
+    return events_controller.expire()
+
 @app.route('/test-logging')
 def test_logging():
     app.logger.info("This is an INFO test log message.")
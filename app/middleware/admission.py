@@ -0,0 +1,174 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import request, jsonify
+
+def _shed(status, message, retry_after):
+    response = jsonify({'error': message})
+    response.status_code = status
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    # Lets outer rate limits give back their token when an inner check sheds
+    response.shed = True
+    return response
+
+def client_ip():
+    """
+    Client address as seen by nginx, falling back to the direct peer. nginx sets
+    X-Real-IP to the connection's address; the left of X-Forwarded-For is
+    whatever the client sent, so only its right-most entry (appended by the
+    proxy in front of us) is trusted.
+    """
+    real_ip = request.headers.get('X-Real-IP')
+    if real_ip:
+        return real_ip.strip()
+    forwarded = request.headers.get('X-Forwarded-For')
+    if forwarded:
+        return forwarded.split(',')[-1].strip()
+    return request.remote_addr
+
+class ConcurrencyLimiter:
+    """
+    Caps how many requests run a route at once, with a bounded wait queue.
+
+    A request that finds every slot busy waits up to `queue_timeout` seconds,
+    but only if fewer than `max_queue` requests are already waiting; otherwise
+    it is rejected immediately so clients get a fast answer instead of a slow
+    timeout.
+    """
+
+    def __init__(self, name, max_concurrent, max_queue, queue_timeout):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._reset()
+        # Preloaded apps fork after this is built; children start with fresh state
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+
+    def acquire(self):
+        with self._cond:
+            if self._active < self.max_concurrent:
+                self._active += 1
+                return True
+            if self._waiting >= self.max_queue:
+                return False
+            self._waiting += 1
+            try:
+                admitted = self._cond.wait_for(lambda: self._active < self.max_concurrent, self.queue_timeout)
+            finally:
+                self._waiting -= 1
+            if admitted:
+                self._active += 1
+            return admitted
+
+    def release(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+class TokenBucketLimiter:
+    """
+    Per-key token buckets: each key may make `burst` requests at once and then
+    `rate` requests per second. Only the `max_keys` most recently seen keys are
+    tracked, so memory stays bounded under many distinct clients.
+    """
+
+    def __init__(self, rate, burst, max_keys=10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._reset()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    def allow(self, key):
+        """Take a token for key. Returns (allowed, seconds until the next token)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, (1 - tokens) / self.rate if not allowed else 0
+
+    def refund(self, key):
+        """Give back a token taken by allow() for a request that was then rejected."""
+        with self._lock:
+            if key in self._buckets:
+                tokens, updated = self._buckets[key]
+                self._buckets[key] = (min(self.burst, tokens + 1), updated)
+
+def admission_controlled(limiter, max_queue_age=None):
+    """
+    Decorator running the view inside one of the limiter's slots, answering 503
+    with Retry-After when the route is saturated.
+
+    If `max_queue_age` is set, requests that already spent longer than that (in
+    seconds) queued in front of the app are shed too. nginx stamps the time it
+    received the request in X-Request-Start; with sync workers that backlog is
+    where requests pile up, so this is what keeps latency bounded there.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if max_queue_age is not None:
+                queued = _queue_age()
+                if queued is not None and queued > max_queue_age:
+                    return _shed(503, f"Server is busy ({limiter.name}), please retry", limiter.queue_timeout)
+
+            if not limiter.acquire():
+                return _shed(503, f"Server is busy ({limiter.name}), please retry", limiter.queue_timeout)
+            try:
+                return f(*args, **kwargs)
+            finally:
+                limiter.release()
+        return decorated
+    return decorator
+
+def rate_limited(bucket, key_func, message='Too many requests, please retry later'):
+    """
+    Decorator answering 429 with Retry-After once key_func()'s bucket is empty.
+
+    The token is only kept if the request gets past every check inside this
+    one: when an inner rate limit or admission check sheds it, the token is
+    given back.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            key = key_func()
+            if key is not None:
+                allowed, retry_after = bucket.allow(key)
+                if not allowed:
+                    return _shed(429, message, retry_after)
+            response = f(*args, **kwargs)
+            if key is not None and getattr(response, 'shed', False):
+                bucket.refund(key)
+            return response
+        return decorated
+    return decorator
+
+def _queue_age():
+    # nginx's $msec is "seconds.milliseconds", sent as "t=<msec>"
+    header = request.headers.get('X-Request-Start', '')
+    try:
+        return time.time() - float(header[2:] if header.startswith('t=') else header)
+    except ValueError:
+        return None
@@ -0,0 +1,84 @@
+import gzip
+import hashlib
+import logging
+from functools import wraps
+from flask import request, make_response
+
+# Bodies smaller than this are sent as-is; gzip overhead outweighs the savings
+MIN_COMPRESS_BYTES = 1024
+COMPRESS_LEVEL = 6
+
+def _etag(generation, extra=''):
+    """ETag for the current request against a given index generation."""
+    digest = hashlib.sha1()
+    for part in (str(generation), str(extra), request.method, request.full_path, request.get_data(cache=True)):
+        digest.update(part if isinstance(part, bytes) else part.encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def _accepts_gzip():
+    return request.accept_encodings['gzip'] > 0
+
+def compress_response(response):
+    """Gzip a response in place when the client accepts it and the body is large enough."""
+    if (response.status_code != 200 or response.direct_passthrough
+            or 'Content-Encoding' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+    if not _accepts_gzip():
+        return response
+
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_BYTES:
+        return response
+    response.set_data(gzip.compress(data, compresslevel=COMPRESS_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+def cached_response(generation, max_age, vary=None):
+    """
+    Decorator adding conditional GET and compression to a read-only endpoint.
+
+    `generation` is a callable returning an identifier that changes whenever
+    the data behind the endpoint changes (or None if unknown, which disables
+    ETags). The ETag covers the generation, method, path, query string and
+    body, so a matching If-None-Match is answered with 304 without running
+    the view. Only GET and HEAD are conditional (RFC 9110); other methods go
+    straight to the view and are only compressed. `max_age` is a callable returning the Cache-Control lifetime.
+    `vary`, if given, is a callable returning any other input the response
+    depends on, such as a default resolved from today's date.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                response = make_response(f(*args, **kwargs))
+                if response.status_code == 200:
+                    response.headers['Cache-Control'] = 'no-cache'
+                return compress_response(response)
+
+            try:
+                current = generation()
+            except Exception as e:
+                logging.warning(f"Could not determine index generation, skipping ETag: {e}")
+                current = None
+
+            # Weak, because the gzip and identity encodings share one tag
+            etag = _etag(current, vary() if vary else '') if current is not None else None
+            cache_control = f"public, max-age={int(max_age())}"
+
+            if etag and request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+                response.set_etag(etag, weak=True)
+                response.headers['Cache-Control'] = cache_control
+                response.vary.add('Accept-Encoding')
+                return response
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                if etag:
+                    response.set_etag(etag, weak=True)
+                response.headers['Cache-Control'] = cache_control
+            return compress_response(response)
+        return decorated
+    return decorator
@@ -0,0 +1,164 @@
+import cProfile
+import hmac
+import io
+import logging
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+from flask import request, jsonify, g, send_from_directory, abort
+
+# Profiles are summarized against the app's own modules (controllers, services, scrapers, normalizer)
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SUMMARY_LINES = 40
+PROFILE_NAME = re.compile(r'^[\w.-]+\.(prof|txt)$')
+
+# Only one request per process is profiled at a time, so thread hooks never overlap
+_active = threading.Lock()
+
+# From 3.12 cProfile runs on sys.monitoring, which allows a single profiler per
+# process, so a second Profile in a pool thread fails to enable. It is also not
+# needed there: the request's Profile already sees every thread.
+PROFILE_POOL_THREADS = sys.version_info < (3, 12)
+
+def _token_matches(app, provided):
+    token = app.config['PROFILING_TOKEN']
+    return bool(token and provided) and hmac.compare_digest(token, provided)
+
+class _RequestProfile:
+    """
+    Profiles the request thread plus any ThreadPoolExecutor threads it starts
+    (the refresh scrapes and normalizes cities in a pool). Pool threads exit
+    before the request finishes, so their profiles are complete when merged.
+    On Python 3.12+ the request's profile is process-wide instead, so it
+    records every thread, including other requests served concurrently.
+    Under gevent workers the request thread's profile also includes any other
+    greenlets that ran while it waited.
+    """
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.thread_profiles = []
+        self.started = time.perf_counter()
+
+    def _thread_hook(self, frame, event, arg):
+        sys.setprofile(None)
+        if threading.current_thread().name.startswith('ThreadPoolExecutor'):
+            profile = cProfile.Profile()
+            self.thread_profiles.append(profile)
+            profile.enable()
+
+    def start(self):
+        if PROFILE_POOL_THREADS:
+            threading.setprofile(self._thread_hook)
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+        if PROFILE_POOL_THREADS:
+            threading.setprofile(None)
+        stats = pstats.Stats(self.profile, stream=io.StringIO())
+        for profile in self.thread_profiles:
+            profile.disable()
+            stats.add(profile)
+        return stats
+
+def _write_profile(directory, name, stats, header, max_files):
+    stats.dump_stats(os.path.join(directory, f"{name}.prof"))
+
+    summary = io.StringIO()
+    summary.write(header + "\n\n")
+    stats.stream = summary
+    stats.sort_stats('cumulative').print_stats(re.escape(APP_DIR), SUMMARY_LINES)
+    with open(os.path.join(directory, f"{name}.txt"), 'w') as f:
+        f.write(summary.getvalue())
+
+    # Keep the directory bounded: drop the oldest profiles beyond max_files
+    profiles = sorted(entry for entry in os.listdir(directory) if entry.endswith('.prof'))
+    for old in profiles[:-max_files] if len(profiles) > max_files else []:
+        for suffix in ('.prof', '.txt'):
+            try:
+                os.remove(os.path.join(directory, old[:-len('.prof')] + suffix))
+            except FileNotFoundError:
+                pass
+
+def init_profiling(app):
+    """
+    Register on-demand request profiling. A request is profiled when it sends
+    X-Profile-Token matching PROFILING_TOKEN, or when it is picked by
+    PROFILING_SAMPLE_RATE. Each profile is written to PROFILING_DIR as a
+    .prof file (for pstats/snakeviz) and a .txt summary of the app's hottest
+    functions, and listed at /debug/profiles.
+
+    When PROFILING_ENABLED is off nothing is registered, so there is no
+    per-request cost at all.
+    """
+    if not app.config['PROFILING_ENABLED']:
+        return
+
+    directory = app.config['PROFILING_DIR']
+    sample_rate = app.config['PROFILING_SAMPLE_RATE']
+    max_files = app.config['PROFILING_MAX_FILES']
+    os.makedirs(directory, exist_ok=True)
+    app.logger.info(f"Request profiling enabled: sample rate {sample_rate}, writing to {directory}")
+
+    @app.before_request
+    def start_profile():
+        if not (_token_matches(app, request.headers.get('X-Profile-Token'))
+                or (sample_rate and random.random() < sample_rate)):
+            return
+        if not _active.acquire(blocking=False):
+            return
+        endpoint = (request.endpoint or 'unknown').replace('.', '_')
+        g.profile_name = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{endpoint}-{random.randrange(16 ** 4):04x}"
+        g.request_profile = _RequestProfile()
+        g.request_profile.start()
+
+    @app.after_request
+    def tag_profile(response):
+        if 'request_profile' in g:
+            response.headers['X-Profile-Id'] = g.profile_name
+        return response
+
+    @app.teardown_request
+    def stop_profile(exc):
+        request_profile = g.pop('request_profile', None)
+        if request_profile is None:
+            return
+        try:
+            stats = request_profile.stop()
+            elapsed_ms = (time.perf_counter() - request_profile.started) * 1000
+            header = f"{request.method} {request.full_path} -> {request.endpoint} in {elapsed_ms:.1f} ms"
+            _write_profile(directory, g.profile_name, stats, header, max_files)
+            logging.info(f"Wrote request profile {g.profile_name}: {header}")
+        except Exception as e:
+            logging.error(f"Failed to write request profile: {e}")
+        finally:
+            _active.release()
+
+    @app.route('/debug/profiles')
+    def list_profiles():
+        if not _token_matches(app, request.headers.get('X-Profile-Token')):
+            return jsonify({'message': 'Profiling token is missing or invalid.'}), 403
+        profiles = []
+        for entry in sorted(os.listdir(directory), reverse=True):
+            if entry.endswith('.prof'):
+                name = entry[:-len('.prof')]
+                profiles.append({
+                    'name': name,
+                    'bytes': os.path.getsize(os.path.join(directory, entry)),
+                    'profile': f"/debug/profiles/{name}.prof",
+                    'summary': f"/debug/profiles/{name}.txt"
+                })
+        return jsonify({'profiles': profiles})
+
+    @app.route('/debug/profiles/<filename>')
+    def get_profile(filename):
+        if not _token_matches(app, request.headers.get('X-Profile-Token')):
+            return jsonify({'message': 'Profiling token is missing or invalid.'}), 403
+        if not PROFILE_NAME.match(filename):
+            abort(404)
+        return send_from_directory(directory, filename, as_attachment=filename.endswith('.prof'))
@@ -0,0 +1,71 @@
+"""
+Cold-start guard: imports the app in a fresh interpreter under
+`python -X importtime` and fails if startup regresses.
+
+Two checks run:
+1. Heavy SDKs that are meant to load lazily must not be imported by `app.main`.
+2. The cumulative import time of `app.main` must stay under a budget.
+
+Run from the repository root:
+    python app/scripts/check_import_time.py [--budget-ms 1500]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+# Modules that are only needed once a request actually reaches the dependency
+LAZY_MODULES = ["twilio.rest", "watchtower", "bs4", "src.orchestrator"]
+
+DEFAULT_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", "1500"))
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def profile_import(module):
+    """Import module in a clean interpreter, returning {name: cumulative_us} and the loaded modules."""
+    code = f"import sys, {module}; print('\\n'.join(sys.modules))"
+    env = {k: v for k, v in os.environ.items() if k != "FLASK_ENV"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"Importing {module} failed")
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2))
+    return cumulative, set(result.stdout.split())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to report")
+    args = parser.parse_args()
+
+    cumulative, loaded = profile_import(args.module)
+    total_ms = cumulative.get(args.module, 0) / 1000
+
+    print(f"{args.module} cold import: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    print("Slowest imports (cumulative):")
+    for name, us in sorted(cumulative.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failures = [f"{name} is imported at startup but should load lazily" for name in LAZY_MODULES if name in loaded]
+    if total_ms > args.budget_ms:
+        failures.append(f"cold import took {total_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
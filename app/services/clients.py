@@ -0,0 +1,121 @@
+import os
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from werkzeug.exceptions import ServiceUnavailable
+
+# Process-wide SDK clients, created on first use rather than at import time.
+# Building a boto3 resource or a Twilio client loads large service models, so
+# doing it lazily keeps worker boot fast. The registry is cleared in forked
+# children so gunicorn --preload workers never share the master's connections.
+_clients = {}
+# Reentrant because some factories build on other registered clients
+_lock = threading.RLock()
+
+# Per-dependency connection limits and timeouts. Each dependency gets a pool of
+# at most *_MAX_CONNECTIONS connections and the same number of concurrent calls;
+# callers wait up to DEPENDENCY_QUEUE_TIMEOUT_SECONDS for a slot. Under the
+# async (gevent) server mode these bound how many requests pile up on one
+# dependency instead of the number of worker processes.
+MEILI_MAX_CONNECTIONS = int(os.environ.get('MEILI_MAX_CONNECTIONS', '50'))
+MEILI_TIMEOUT_SECONDS = float(os.environ.get('MEILI_TIMEOUT_SECONDS', '5'))
+DYNAMODB_MAX_CONNECTIONS = int(os.environ.get('DYNAMODB_MAX_CONNECTIONS', '50'))
+DYNAMODB_CONNECT_TIMEOUT_SECONDS = float(os.environ.get('DYNAMODB_CONNECT_TIMEOUT_SECONDS', '2'))
+DYNAMODB_READ_TIMEOUT_SECONDS = float(os.environ.get('DYNAMODB_READ_TIMEOUT_SECONDS', '5'))
+TWILIO_MAX_CONNECTIONS = int(os.environ.get('TWILIO_MAX_CONNECTIONS', '10'))
+TWILIO_TIMEOUT_SECONDS = float(os.environ.get('TWILIO_TIMEOUT_SECONDS', '10'))
+DEPENDENCY_QUEUE_TIMEOUT_SECONDS = float(os.environ.get('DEPENDENCY_QUEUE_TIMEOUT_SECONDS', '2'))
+
+class DependencyBusy(ServiceUnavailable):
+    """Raised when every connection slot for a dependency stayed busy past the queue timeout."""
+
+    def __init__(self, dependency):
+        super().__init__(description=f"{dependency} is busy, please retry", retry_after=1)
+        self.dependency = dependency
+
+def _reset_after_fork():
+    global _lock
+    _clients.clear()
+    _lock = threading.RLock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def get_client(key, factory):
+    """Return the client registered under key, calling factory() to create it on first use."""
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = factory()
+    return client
+
+@contextmanager
+def dependency_slot(dependency, max_connections):
+    """Hold one of the dependency's concurrent call slots, raising DependencyBusy if none frees up in time."""
+    slots = get_client(('slots', dependency), lambda: threading.BoundedSemaphore(max_connections))
+    if not slots.acquire(timeout=DEPENDENCY_QUEUE_TIMEOUT_SECONDS):
+        raise DependencyBusy(dependency)
+    try:
+        yield
+    finally:
+        slots.release()
+
+class _Limited:
+    """Proxy that runs every method call on the wrapped client inside a dependency slot."""
+
+    def __init__(self, target, dependency, max_connections):
+        self._target = target
+        self._dependency = dependency
+        self._max_connections = max_connections
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        @wraps(attr)
+        def call(*args, **kwargs):
+            with dependency_slot(self._dependency, self._max_connections):
+                return attr(*args, **kwargs)
+        return call
+
+def dynamodb_resource(region):
+    def factory():
+        import boto3
+        from botocore.config import Config
+        config = Config(
+            max_pool_connections=DYNAMODB_MAX_CONNECTIONS,
+            connect_timeout=DYNAMODB_CONNECT_TIMEOUT_SECONDS,
+            read_timeout=DYNAMODB_READ_TIMEOUT_SECONDS,
+            retries={'max_attempts': 3, 'mode': 'standard'}
+        )
+        return boto3.resource('dynamodb', region_name=region, config=config)
+    return get_client(('dynamodb', region), factory)
+
+def dynamodb_table(region, name):
+    # Tables share the resource's connection pool, and so its slots
+    def factory():
+        resource = dynamodb_resource(region)
+        return _Limited(resource.Table(name), 'DynamoDB', DYNAMODB_MAX_CONNECTIONS)
+    return get_client(('dynamodb-table', region, name), factory)
+
+def limited_dynamodb_resource(region):
+    return get_client(('dynamodb-limited', region),
+                      lambda: _Limited(dynamodb_resource(region), 'DynamoDB', DYNAMODB_MAX_CONNECTIONS))
+
+def meilisearch_search_client(url, api_key):
+    def factory():
+        from src.meilisearch_client import PooledSearchClient
+        client = PooledSearchClient(url, api_key, MEILI_MAX_CONNECTIONS, MEILI_TIMEOUT_SECONDS)
+        return _Limited(client, 'Meilisearch', MEILI_MAX_CONNECTIONS)
+    return get_client(('meilisearch-search', url), factory)
+
+def twilio_client(account_sid, auth_token):
+    def factory():
+        from twilio.rest import Client
+        from twilio.http.http_client import TwilioHttpClient
+        http_client = TwilioHttpClient(pool_connections=True, timeout=TWILIO_TIMEOUT_SECONDS)
+        return Client(account_sid, auth_token, http_client=http_client)
+    return get_client('twilio', factory)
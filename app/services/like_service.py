@@ -0,0 +1,230 @@
+import atexit
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+from botocore.exceptions import ClientError
+from services.clients import dynamodb_table
+
+# Likeable item types, mapped to the table holding the counter and its hash key
+LIKE_TARGETS = {
+    'post': ('posts', 'post_id'),
+    'comment': ('comments', 'id'),
+}
+# How many items' stored like_count a worker remembers between likes, and for
+# how long: other workers flush their likes too, so a remembered count ages out
+KNOWN_TARGETS_MAX = 10000
+KNOWN_COUNT_TTL_SECONDS = 15
+
+class LikeService:
+    """
+    Records likes idempotently in the `likes` table and keeps `like_count` on
+    posts and comments up to date without a write to the (possibly hot) item
+    on every like.
+
+    Counter changes are buffered in-process and flushed on an interval as one
+    atomic ADD per item, so a burst of likes on a popular post costs a single
+    update per flush. Reads merge the pending deltas back in.
+
+    The stored like_count of recently liked items is remembered in-process and
+    refreshed from each flush's result, so liking a hot item reads it at most
+    once per KNOWN_COUNT_TTL_SECONDS per worker rather than once per like.
+    """
+
+    def __init__(self, app):
+        self.logger = app.logger
+        self.flush_interval = app.config['LIKE_FLUSH_INTERVAL_SECONDS']
+        self.region = app.config['AWS_REGION']
+
+        self._reset_buffer()
+        atexit.register(self.flush)
+        # A forked worker must not share the parent's lock or flusher thread
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_buffer)
+
+    def _reset_buffer(self):
+        self._pending = {}
+        # Deltas taken by a flush that is still writing them
+        self._inflight = {}
+        # Stored like_count of items known to exist, most recently used last
+        self._known = OrderedDict()
+        self._lock = threading.Lock()
+        # Serializes flushes, so the interval flush and the exit flush never overlap
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher = None
+
+    @property
+    def likes_table(self):
+        return dynamodb_table(self.region, 'likes')
+
+    def _target_table(self, target_type):
+        return dynamodb_table(self.region, LIKE_TARGETS[target_type][0])
+
+    def _key(self, target_type, target_id):
+        return {LIKE_TARGETS[target_type][1]: target_id}
+
+    def _add_pending(self, target_type, target_id, delta):
+        with self._lock:
+            key = (target_type, target_id)
+            self._pending[key] = self._pending.get(key, 0) + delta
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name='like-flusher', daemon=True)
+                self._flusher.start()
+
+    def pending_delta(self, target_type, target_id):
+        key = (target_type, target_id)
+        with self._lock:
+            return self._pending.get(key, 0) + self._inflight.get(key, 0)
+
+    def like_count(self, target_type, item):
+        """Stored like_count of an item plus any increments not yet flushed."""
+        _, hash_key = LIKE_TARGETS[target_type]
+        return int(item.get('like_count', 0)) + self.pending_delta(target_type, item[hash_key])
+
+    def _remember(self, key, stored_count):
+        # Callers hold self._lock
+        self._known.pop(key, None)
+        self._known[key] = (stored_count, time.monotonic())
+        while len(self._known) > KNOWN_TARGETS_MAX:
+            self._known.popitem(last=False)
+
+    def get_like_count(self, target_type, target_id):
+        """
+        Current like count of an item, or None if the item does not exist.
+        Items seen recently are answered from memory without a read.
+        """
+        key = (target_type, target_id)
+        with self._lock:
+            stored_count, remembered_at = self._known.get(key, (None, 0))
+            if stored_count is not None and time.monotonic() - remembered_at < KNOWN_COUNT_TTL_SECONDS:
+                return stored_count + self._pending.get(key, 0) + self._inflight.get(key, 0)
+
+        try:
+            response = self._target_table(target_type).get_item(
+                Key=self._key(target_type, target_id),
+                ProjectionExpression='like_count'
+            )
+        except ClientError as e:
+            self.logger.error(f"DynamoDB get_item failed for {target_type} {target_id}: {e.response['Error']['Message']}")
+            return None
+        if 'Item' not in response:
+            return None
+        stored_count = int(response['Item'].get('like_count', 0))
+        with self._lock:
+            self._remember(key, stored_count)
+        return stored_count + self.pending_delta(target_type, target_id)
+
+    def like(self, target_type, target_id, user_id):
+        """
+        Record that user_id likes the item. Returns True if the like is new,
+        False if it already existed, and None if the write failed.
+        """
+        self.logger.info(f"User {user_id} liking {target_type} {target_id}")
+        try:
+            self.likes_table.put_item(
+                Item={
+                    'target_id': f"{target_type}#{target_id}",
+                    'user_id': user_id,
+                    'created_at': datetime.utcnow().isoformat()
+                },
+                ConditionExpression='attribute_not_exists(user_id)'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                self.logger.info(f"User {user_id} already likes {target_type} {target_id}")
+                return False
+            self.logger.error(f"DynamoDB put_item failed for like on {target_type} {target_id}: {e.response['Error']['Message']}")
+            return None
+        self._add_pending(target_type, target_id, 1)
+        return True
+
+    def unlike(self, target_type, target_id, user_id):
+        """
+        Remove user_id's like from the item. Returns True if a like was removed,
+        False if there was none, and None if the delete failed.
+        """
+        self.logger.info(f"User {user_id} unliking {target_type} {target_id}")
+        try:
+            self.likes_table.delete_item(
+                Key={'target_id': f"{target_type}#{target_id}", 'user_id': user_id},
+                ConditionExpression='attribute_exists(user_id)'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                self.logger.info(f"User {user_id} does not like {target_type} {target_id}")
+                return False
+            self.logger.error(f"DynamoDB delete_item failed for like on {target_type} {target_id}: {e.response['Error']['Message']}")
+            return None
+        self._add_pending(target_type, target_id, -1)
+        return True
+
+    def flush(self):
+        """
+        Apply all buffered counter deltas, one atomic ADD per item. A delta that
+        fails to apply, for whatever reason, goes back into the buffer and is
+        retried on the next flush.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._inflight = dict(pending)
+
+            unapplied = dict(pending)
+            try:
+                for key, delta in pending.items():
+                    try:
+                        stored_count = self._flush_one(*key, delta) if delta != 0 else None
+                    except Exception as e:
+                        self.logger.error(f"Failed to flush like count for {key[0]} {key[1]}: {e}")
+                        continue
+                    # Swap the in-flight delta for the new stored count in one step,
+                    # so concurrent reads never count it twice
+                    with self._lock:
+                        del unapplied[key]
+                        self._inflight.pop(key, None)
+                        if stored_count is not None:
+                            self._remember(key, stored_count)
+            finally:
+                with self._lock:
+                    for key, delta in unapplied.items():
+                        self._inflight.pop(key, None)
+                        self._pending[key] = self._pending.get(key, 0) + delta
+
+    def _flush_one(self, target_type, target_id, delta):
+        """
+        Apply one delta, returning the item's new stored like_count, or None if
+        the item no longer exists. Raises if the update failed.
+        """
+        _, hash_key = LIKE_TARGETS[target_type]
+        key = (target_type, target_id)
+        try:
+            response = self._target_table(target_type).update_item(
+                Key=self._key(target_type, target_id),
+                UpdateExpression='ADD like_count :delta',
+                ConditionExpression=f'attribute_exists({hash_key})',
+                ExpressionAttributeValues={':delta': Decimal(delta)},
+                ReturnValues='UPDATED_NEW'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                # The item was deleted; there is no counter left to update
+                self.logger.info(f"Dropping like delta for missing {target_type} {target_id}")
+                with self._lock:
+                    self._known.pop(key, None)
+                return None
+            raise
+        # The stored count now includes every worker's flushed likes
+        return int(response['Attributes']['like_count'])
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"Like counter flush failed: {e}")
+
+def initialize_like_service(app):
+    return LikeService(app)
@@ -0,0 +1,88 @@
+import uuid
+from datetime import datetime
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+from services.clients import dynamodb_table
+
+class PostService:
+    def __init__(self, app):
+        self.logger = app.logger
+        self.region = app.config['AWS_REGION']
+
+    @property
+    def table(self):
+        return dynamodb_table(self.region, 'posts')
+
+    def _query_index(self, index_name, key_name, key_value, limit, exclusive_start_key=None):
+        """
+        Run a single key-condition query against a GSI.
+
+        Returns a (items, last_evaluated_key) tuple, or None if the query failed.
+        last_evaluated_key is None once the last page has been read.
+        """
+        params = {
+            'IndexName': index_name,
+            'KeyConditionExpression': Key(key_name).eq(key_value),
+            'Limit': limit
+        }
+        if exclusive_start_key:
+            params['ExclusiveStartKey'] = exclusive_start_key
+
+        try:
+            response = self.table.query(**params)
+            items = response.get('Items', [])
+            self.logger.info(f"Found {len(items)} posts on {index_name} for {key_name} {key_value}")
+            return items, response.get('LastEvaluatedKey')
+        except ClientError as e:
+            self.logger.error(f"DynamoDB query on {index_name} failed for {key_name} {key_value}: {e.response['Error']['Message']}")
+            return None
+
+    def find_posts_by_event_id(self, event_id, limit, exclusive_start_key=None):
+        self.logger.info(f"Querying posts for event ID: {event_id}")
+        return self._query_index('EventIdIndex', 'event_id', event_id, limit, exclusive_start_key)
+
+    def find_posts_by_user_id(self, user_id, limit, exclusive_start_key=None):
+        self.logger.info(f"Querying posts for user ID: {user_id}")
+        return self._query_index('UserIdIndex', 'user_id', user_id, limit, exclusive_start_key)
+
+    def find_post_by_id(self, post_id):
+        self.logger.info(f"Querying for post with ID: {post_id}")
+        try:
+            response = self.table.get_item(Key={'post_id': post_id})
+            item = response.get('Item')
+            if item:
+                self.logger.info(f"Found post for ID {post_id}")
+                return item
+            self.logger.info(f"No post found for ID: {post_id}")
+            return None
+        except ClientError as e:
+            self.logger.error(f"DynamoDB get_item failed for post ID {post_id}: {e.response['Error']['Message']}")
+            return None
+
+    def create_post(self, user_id, event_id, header_text, body_text, photo_urls):
+        post_id = str(uuid.uuid4())
+        now = datetime.utcnow().isoformat()
+        self.logger.info(f"Attempting to create post {post_id} for user {user_id} on event {event_id}")
+        post = {
+            'post_id': post_id,
+            'user_id': user_id,
+            'event_id': event_id,
+            'header_text': header_text,
+            'body_text': body_text,
+            'photo_urls': photo_urls,
+            'comment_ids': [],
+            'comment_count': 0,
+            'like_count': 0,
+            'created_at': now,
+            'updated_at': now
+        }
+        try:
+            self.table.put_item(Item=post)
+            self.logger.info(f"Successfully created post: {post_id}")
+            return post
+        except ClientError as e:
+            self.logger.error(f"DynamoDB put_item failed for new post by user {user_id}: {e.response['Error']['Message']}")
+            return None
+
+def initialize_post_service(app):
+    return PostService(app)
@@ -1,13 +1,26 @@
-import boto3
+import time
 import uuid
 from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
+from services.clients import limited_dynamodb_resource, dynamodb_table
+
+# DynamoDB caps BatchGetItem at 100 keys per call
+BATCH_GET_MAX_KEYS = 100
+BATCH_GET_MAX_ATTEMPTS = 3
 
 class UserService:
     def __init__(self, app):
         self.logger = app.logger
-        self.dynamodb = boto3.resource('dynamodb', region_name=app.config['AWS_REGION'])
-        self.table = self.dynamodb.Table('users')
+        self.region = app.config['AWS_REGION']
+
+    # The DynamoDB resource is created on first use, not at import time
+    @property
+    def dynamodb(self):
+        return limited_dynamodb_resource(self.region)
+
+    @property
+    def table(self):
+        return dynamodb_table(self.region, 'users')
 
     def find_user_by_phone_number(self, phone_number):
         self.logger.info(f"Querying for user with phone number: {phone_number}")
@@ -41,6 +54,42 @@ class UserService:
             self.logger.error(f"DynamoDB get_item failed for user ID {user_id}: {e.response['Error']['Message']}")
             return None
 
+    def find_users_by_ids(self, user_ids):
+        """
+        Fetch several users in batched reads. Returns a dict keyed by user_id;
+        users that do not exist (or could not be read) are omitted.
+        """
+        user_ids = list(dict.fromkeys(uid for uid in user_ids if uid))
+        users = {}
+        if not user_ids:
+            return users
+
+        self.logger.info(f"Batch querying {len(user_ids)} users")
+        for start in range(0, len(user_ids), BATCH_GET_MAX_KEYS):
+            request_items = {
+                self.table.name: {
+                    'Keys': [{'user_id': uid} for uid in user_ids[start:start + BATCH_GET_MAX_KEYS]],
+                    'ProjectionExpression': 'user_id, #name',
+                    'ExpressionAttributeNames': {'#name': 'name'}
+                }
+            }
+            for attempt in range(BATCH_GET_MAX_ATTEMPTS):
+                try:
+                    response = self.dynamodb.batch_get_item(RequestItems=request_items)
+                except ClientError as e:
+                    self.logger.error(f"DynamoDB batch_get_item failed for users: {e.response['Error']['Message']}")
+                    break
+                for item in response.get('Responses', {}).get(self.table.name, []):
+                    users[item['user_id']] = item
+                request_items = response.get('UnprocessedKeys')
+                if not request_items:
+                    break
+                # Unprocessed keys mean the table was throttled; back off before retrying
+                time.sleep(0.05 * 2 ** attempt)
+            else:
+                self.logger.warning("Gave up on unprocessed keys in users batch read")
+        return users
+
     def create_user(self, phone_number):
         user_id = str(uuid.uuid4())
         self.logger.info(f"Attempting to create new user with ID {user_id} for phone number: {phone_number}")
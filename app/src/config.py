@@ -8,4 +8,7 @@ MEILI_MASTER_KEY = os.environ.get("MEILI_MASTER_KEY", "piszah-9Fuhde-pangaw")
 DEFAULT_COUNTRY = os.environ.get("DEFAULT_COUNTRY", "us")
 OUTPUT_FILE = os.environ.get("OUTPUT_FILE", "events.json")
 
-SAVE_TO_MEILISEARCH = os.environ.get("SAVE_TO_MEILISEARCH", "false").lower() == "true" 
\ No newline at end of file
+SAVE_TO_MEILISEARCH = os.environ.get("SAVE_TO_MEILISEARCH", "false").lower() == "true" 
+
+# Events dated more than this many days in the past are removed on refresh.
+EVENT_RETENTION_DAYS = float(os.environ.get("EVENT_RETENTION_DAYS", "1"))
@@ -1,6 +1,10 @@
 import logging
+import re
+import time
 import meilisearch
-from typing import List
+import requests
+from requests.adapters import HTTPAdapter
+from typing import List, Optional
 from src.schema import MusicEvent
 
 def save_events_to_meilisearch(events: List[MusicEvent], meili_client) -> bool:
@@ -26,4 +30,226 @@ def save_events_to_meilisearch(events: List[MusicEvent], meili_client) -> bool:
         return True
     except Exception as e:
         logging.error(f"Failed to save events to Meilisearch: {e}")
-        return False 
\ No newline at end of file
+        return False 
+
+# Upper bound on how long a single indexing task may take during a rebuild
+REBUILD_TASK_TIMEOUT_MS = 10 * 60 * 1000
+REBUILD_BATCH_SIZE = 1000
+# A rebuild is refused if the new corpus is smaller than this share of the live
+# index, which is what a scraping outage looks like rather than real churn
+REBUILD_MIN_RATIO = 0.5
+# Shadow indexes older than this were left behind by a rebuild that died
+# (e.g. a worker killed by gunicorn's timeout) and are dropped by the next one
+STALE_SHADOW_AGE_MS = 60 * 60 * 1000
+SHADOW_UID = re.compile(r'^events_(\d+)$')
+# The pinned SDK speaks the Meilisearch v1 API; index swaps need at least 1.0
+MIN_SERVER_VERSION = (1, 0)
+
+def check_server_version(meili_client) -> None:
+    """Raise if the Meilisearch server is older than MIN_SERVER_VERSION."""
+    version = meili_client.get_version()['pkgVersion']
+    parsed = tuple(int(part) for part in version.split('-')[0].split('.')[:2])
+    if parsed < MIN_SERVER_VERSION:
+        minimum = '.'.join(str(part) for part in MIN_SERVER_VERSION)
+        raise RuntimeError(f"Meilisearch {version} is not supported, {minimum} or newer is required")
+
+def _task_uid(task):
+    # The task reference shape changed across SDK/server versions
+    if isinstance(task, dict):
+        return task.get('taskUid', task.get('uid'))
+    return getattr(task, 'task_uid', None)
+
+def _wait_for_task(meili_client, task) -> None:
+    """Block until an enqueued task finishes, raising if it did not succeed."""
+    result = meili_client.wait_for_task(_task_uid(task), timeout_in_ms=REBUILD_TASK_TIMEOUT_MS)
+    status = result.get('status') if isinstance(result, dict) else result.status
+    if status != 'succeeded':
+        error = result.get('error') if isinstance(result, dict) else result.error
+        raise RuntimeError(f"Meilisearch task {_task_uid(task)} {status}: {error}")
+
+def _document_count(index) -> int:
+    stats = index.get_stats()
+    return stats['numberOfDocuments'] if isinstance(stats, dict) else stats.number_of_documents
+
+def _delete_stale_shadows(meili_client) -> None:
+    now_ms = int(time.time() * 1000)
+    indexes = meili_client.get_raw_indexes({'limit': 1000})
+    for info in indexes['results'] if isinstance(indexes, dict) else indexes:
+        match = SHADOW_UID.match(info['uid'])
+        if match and now_ms - int(match.group(1)) > STALE_SHADOW_AGE_MS:
+            logging.info(f"Deleting stale shadow index {info['uid']}")
+            try:
+                meili_client.index(info['uid']).delete()
+            except Exception as e:
+                logging.warning(f"Could not delete stale shadow index {info['uid']}: {e}")
+
+def rebuild_events_index(events: List[MusicEvent], meili_client) -> bool:
+    """
+    Replace the contents of the events index without disturbing searches.
+
+    Events are ingested into a versioned shadow index that copies the live
+    index's settings. Once every indexing task has finished and the document
+    count checks out, the shadow is atomically swapped with `events` and the
+    old data is dropped. If any step fails the shadow index is deleted and
+    `events` is left untouched.
+
+    An empty corpus, or one with fewer than REBUILD_MIN_RATIO of the live
+    index's documents, is refused: that is what a scraping outage produces,
+    and swapping it in would wipe the serving index. Shadows left behind by
+    rebuilds that died are deleted first.
+
+    Args:
+        events: List of normalized events that should make up the new index
+        meili_client: Meilisearch client instance
+
+    Returns:
+        True if the swap happened, False otherwise
+    """
+    shadow_uid = f"events_{int(time.time() * 1000)}"
+    expected = len({event['id'] for event in events})
+    if not expected:
+        logging.error("Refusing to rebuild events index from an empty corpus")
+        return False
+    logging.info(f"Rebuilding events index from {len(events)} events via shadow index {shadow_uid}")
+
+    try:
+        check_server_version(meili_client)
+        _delete_stale_shadows(meili_client)
+    except Exception as e:
+        logging.error(f"Cannot rebuild events index: {e}")
+        return False
+
+    try:
+        try:
+            settings = meili_client.index("events").get_settings()
+            live_count = _document_count(meili_client.index("events"))
+        except meilisearch.errors.MeilisearchApiError:
+            # Swapping requires both indexes to exist
+            logging.info("Events index does not exist yet, creating it")
+            _wait_for_task(meili_client, meili_client.create_index("events", {'primaryKey': 'id'}))
+            settings = None
+            live_count = 0
+        if expected < live_count * REBUILD_MIN_RATIO:
+            raise RuntimeError(f"New corpus has {expected} events but the live index has {live_count}; "
+                               f"refusing to drop more than {1 - REBUILD_MIN_RATIO:.0%} of it")
+
+        _wait_for_task(meili_client, meili_client.create_index(shadow_uid, {'primaryKey': 'id'}))
+        shadow = meili_client.index(shadow_uid)
+        if settings:
+            _wait_for_task(meili_client, shadow.update_settings(settings))
+
+        tasks = [shadow.add_documents(events[start:start + REBUILD_BATCH_SIZE], primary_key='id')
+                 for start in range(0, len(events), REBUILD_BATCH_SIZE)]
+        for task in tasks:
+            _wait_for_task(meili_client, task)
+
+        count = _document_count(shadow)
+        if count != expected:
+            raise RuntimeError(f"Shadow index has {count} documents, expected {expected}")
+
+        _wait_for_task(meili_client, meili_client.swap_indexes([{'indexes': ["events", shadow_uid]}]))
+        logging.info(f"Swapped {shadow_uid} into events with {count} documents")
+    except Exception as e:
+        logging.error(f"Failed to rebuild events index, live index left unchanged: {e}")
+        try:
+            meili_client.index(shadow_uid).delete()
+        except Exception as cleanup_error:
+            logging.warning(f"Could not delete shadow index {shadow_uid}: {cleanup_error}")
+        return False
+
+    # After the swap the shadow uid holds the previous corpus
+    try:
+        meili_client.index(shadow_uid).delete()
+    except Exception as e:
+        logging.warning(f"Rebuild succeeded but old index {shadow_uid} could not be deleted: {e}")
+    return True
+
+def delete_events_from_meilisearch(event_ids: List[str], meili_client, batch_size: int = 500) -> int:
+    """
+    Delete events by id from the events index in batches, waiting for each batch.
+
+    Args:
+        event_ids: Ids of the events to delete
+        meili_client: Meilisearch client instance
+        batch_size: Number of ids per delete request
+
+    Returns:
+        The number of delete batches issued
+    """
+    index = meili_client.index("events")
+    batches = 0
+    for start in range(0, len(event_ids), batch_size):
+        _wait_for_task(meili_client, index.delete_documents(event_ids[start:start + batch_size]))
+        batches += 1
+    logging.info(f"Deleted {len(event_ids)} events from Meilisearch in {batches} batches")
+    return batches
+
+def _document_dict(doc) -> MusicEvent:
+    # Newer SDK versions return Document objects instead of plain dicts
+    if isinstance(doc, dict):
+        return doc
+    return {key: value for key, value in vars(doc).items() if not key.startswith("_")}
+
+
+def fetch_all_events(meili_client, batch_size: int = 1000) -> List[MusicEvent]:
+    """
+    Page through every document in the events index.
+
+    Args:
+        meili_client: Meilisearch client instance
+        batch_size: Number of documents to request per page
+
+    Returns:
+        All events currently stored in Meilisearch
+    """
+    index = meili_client.index("events")
+    events = []
+    offset = 0
+    while True:
+        batch = index.get_documents({"offset": offset, "limit": batch_size})
+        # Depending on SDK and server version a page is a bare list, a raw
+        # {"results": [...], ...} dict, or a DocumentsResults object
+        if isinstance(batch, dict):
+            batch = batch["results"]
+        else:
+            batch = getattr(batch, "results", batch)
+        events.extend(_document_dict(doc) for doc in batch)
+        if len(batch) < batch_size:
+            break
+        offset += batch_size
+    logging.info(f"Fetched {len(events)} events from Meilisearch")
+    return events
+
+
+class PooledSearchClient:
+    """
+    Minimal Meilisearch search client for the request path.
+
+    The SDK issues every call through module-level `requests` functions, so each
+    search opens a new connection. This client keeps a bounded keep-alive pool
+    on one session and applies a timeout to every call.
+    """
+
+    def __init__(self, url: str, api_key: Optional[str], max_connections: int, timeout: float):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections, pool_block=True)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if api_key:
+            self.session.headers['Authorization'] = f"Bearer {api_key}"
+
+    def search(self, index_uid: str, query: str, options: Optional[dict] = None) -> dict:
+        response = self.session.post(
+            f"{self.url}/indexes/{index_uid}/search",
+            json={'q': query, **(options or {})},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def index_info(self, index_uid: str) -> dict:
+        response = self.session.get(f"{self.url}/indexes/{index_uid}", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
@@ -5,6 +5,19 @@ import re
 from src.schema import MusicEvent
 from src.config import DEFAULT_COUNTRY
 
+def parse_event_date(date_str: str) -> Optional[datetime]:
+    """
+    Parses a normalized event date (ISO 8601, as produced by normalize_ra_event)
+    into an aware UTC datetime. Returns None if the string is not a valid date.
+    """
+    try:
+        parsed = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
 def normalize_ra_event(event_data: dict) -> Optional[MusicEvent]:
     """
     Normalizes events from various sources into our MusicEvent schema.
@@ -1,45 +1,117 @@
 import logging
+import math
 from concurrent.futures import ThreadPoolExecutor
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
 
 from src.scrapers.nineteen_hz import get_19hz_events
-from src.normalizer import normalize_ra_event
+from src.normalizer import normalize_ra_event, parse_event_date
 from src.deduplicator import deduplicate_events
 from src.schema import MusicEvent
+from src.meilisearch_client import fetch_all_events, delete_events_from_meilisearch
+from src.suggest_index import SuggestIndex
+from src.upcoming_index import UpcomingIndex
+from src.config import EVENT_RETENTION_DAYS
+
+# Expired events are deleted from Meilisearch in batches of this size
+EXPIRE_BATCH_SIZE = 500
 
 # Define all the cities we want to scrape
 CITIES = ["sf", "la", "seattle", "atlanta", "miami", "dc", "chicago", "detroit", "denver", "vegas", "portland"]
 
 def scrape_city_events(city: str) -> List[MusicEvent]:
-    """Scrape events for a single city and return normalized events."""
-    try:
-        logging.info(f"Scraping events for {city}")
-        raw_events = get_19hz_events(city)
-        
-        # Normalize all events
-        normalized_events = []
-        for event in raw_events:
-            normalized = normalize_ra_event(event)
-            if normalized:
-                normalized_events.append(normalized)
-        
-        logging.info(f"Found {len(normalized_events)} events for {city}")
-        return normalized_events
-    except Exception as e:
-        logging.error(f"Error scraping {city}: {e}")
-        return []
+    """
+    Scrape events for a single city and return normalized events. Raises if the
+    city's listing could not be fetched, so callers can tell an outage from a
+    city with no events.
+    """
+    logging.info(f"Scraping events for {city}")
+    raw_events = get_19hz_events(city, raise_errors=True)
+
+    # Normalize all events
+    normalized_events = []
+    for event in raw_events:
+        normalized = normalize_ra_event(event)
+        if normalized:
+            normalized_events.append(normalized)
+
+    logging.info(f"Found {len(normalized_events)} events for {city}")
+    return normalized_events
+
+def build_event_indexes(events: List[MusicEvent]) -> dict:
+    """Build the in-process lookup indexes served by the events endpoints."""
+    indexes = {
+        "suggest": SuggestIndex.from_events(events),
+        "upcoming": UpcomingIndex.from_events(events),
+        # Every event the indexes were built from, including undated ones the
+        # upcoming index leaves out, so they can be rebuilt after an expiry
+        "events": events,
+    }
+    logging.info(f"Built indexes: {len(indexes['suggest'])} suggest terms, "
+                 f"{len(indexes['upcoming'])} upcoming events")
+    return indexes
+
+def expiry_cutoff(retention_days: float = EVENT_RETENTION_DAYS) -> datetime:
+    """Events dated before this moment are past the retention window."""
+    # Also guards EVENT_RETENTION_DAYS: a negative window would expire every event
+    if not (math.isfinite(retention_days) and retention_days >= 0):
+        raise ValueError(f"Retention must be a non-negative number of days, got {retention_days}")
+    return datetime.now(timezone.utc) - timedelta(days=retention_days)
+
+def is_expired(event: MusicEvent, cutoff: datetime) -> bool:
+    # Events whose date cannot be parsed are kept rather than guessed at
+    event_date = parse_event_date(event.get('date'))
+    return event_date is not None and event_date < cutoff
+
+def prune_event_indexes(indexes: dict, cutoff: datetime) -> dict:
+    """Drop expired events from the in-process indexes built by build_event_indexes."""
+    return build_event_indexes([event for event in indexes["events"] if not is_expired(event, cutoff)])
+
+def expire_past_events(meili_client, retention_days: float = EVENT_RETENTION_DAYS,
+                       dry_run: bool = False, cutoff: Optional[datetime] = None) -> dict:
+    """
+    Delete events older than the retention window from the Meilisearch index.
+
+    Args:
+        meili_client: Meilisearch client instance
+        retention_days: How many days past an event's date it stays searchable
+        dry_run: Only report what would be deleted
+        cutoff: Explicit cutoff, overriding retention_days
+
+    Returns:
+        A report with the cutoff, the number of expired events and a sample of their ids
+    """
+    cutoff = cutoff or expiry_cutoff(retention_days)
+    events = fetch_all_events(meili_client)
+    expired_ids = [event['id'] for event in events if is_expired(event, cutoff)]
+    logging.info(f"{len(expired_ids)} of {len(events)} events are older than {cutoff.isoformat()}"
+                 f"{' (dry run)' if dry_run else ''}")
+
+    report = {
+        "cutoff": cutoff.isoformat(),
+        "dry_run": dry_run,
+        "events_checked": len(events),
+        "events_expired": len(expired_ids),
+        "sample_ids": expired_ids[:20],
+        "batches": 0,
+    }
+    if not dry_run and expired_ids:
+        report["batches"] = delete_events_from_meilisearch(expired_ids, meili_client, EXPIRE_BATCH_SIZE)
+    return report
 
 def refresh_all_events() -> dict:
     """
     Orchestrates the complete event refresh process:
     1. Scrape all cities in parallel
-    2. Deduplicate events
-    3. Return summary statistics
+    2. Deduplicate events and drop those already past the retention window
+    3. Build the in-process lookup indexes
+    4. Return summary statistics, including any cities that failed to scrape
     """
     logging.info("Starting events refresh for all cities")
     
     # Use ThreadPoolExecutor to scrape all cities in parallel
     all_events = []
+    failed_cities = []
     with ThreadPoolExecutor(max_workers=len(CITIES)) as executor:
         # Submit all scraping tasks
         future_to_city = {executor.submit(scrape_city_events, city): city for city in CITIES}
@@ -52,17 +124,24 @@ def refresh_all_events() -> dict:
                 all_events.extend(city_events)
             except Exception as e:
                 logging.error(f"Failed to scrape {city}: {e}")
+                failed_cities.append(city)
     
     # Deduplicate events
     logging.info(f"Deduplicating {len(all_events)} total events")
     deduplicated_events = deduplicate_events(all_events)
+
+    cutoff = expiry_cutoff()
+    current_events = [event for event in deduplicated_events if not is_expired(event, cutoff)]
     
     return {
-        "events": deduplicated_events,
+        "events": current_events,
+        "indexes": build_event_indexes(current_events),
         "stats": {
             "cities_processed": len(CITIES),
+            "cities_failed": failed_cities,
             "events_scraped": len(all_events),
             "events_deduplicated": len(deduplicated_events),
+            "events_past_retention": len(deduplicated_events) - len(current_events),
             "cities": CITIES
         }
     } 
\ No newline at end of file
@@ -4,13 +4,14 @@ from typing import List
 import requests
 from bs4 import BeautifulSoup
 
-def get_19hz_events(region: str = "la") -> List[dict]:
+def get_19hz_events(region: str = "la", raise_errors: bool = False) -> List[dict]:
     """
     Scrapes events from 19hz.info, which focuses on electronic music events
     in various US regions.
     
     Args:
         region: The region to scrape (sf, la, seattle, atlanta, miami, dc, etc.)
+        raise_errors: Raise when the page cannot be fetched instead of returning []
     
     Returns:
         A list of event data dictionaries scraped from 19hz.info
@@ -157,4 +158,6 @@ def get_19hz_events(region: str = "la") -> List[dict]:
         
     except requests.exceptions.RequestException as e:
         logging.error(f"Error fetching data from 19hz.info: {e}")
+        if raise_errors:
+            raise
         return [] 
\ No newline at end of file
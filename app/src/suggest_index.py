@@ -0,0 +1,83 @@
+import heapq
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from src.schema import MusicEvent
+
+# Placeholder values the normalizer and scraper fall back to; never worth suggesting
+IGNORED_TERMS = {"", "unknown", "unknown venue", "unknown city"}
+
+# Prefixes up to this length get their top suggestions precomputed at build time,
+# since short prefixes match the largest ranges of the sorted key array.
+PRECOMPUTED_PREFIX_LENGTH = 2
+
+MAX_SUGGESTIONS = 10
+
+
+def _normalize(term: str) -> str:
+    return " ".join(term.casefold().split())
+
+
+class SuggestIndex:
+    """
+    Compact prefix index over the artists, venues and cities of a refresh.
+
+    Terms are kept in a sorted array so any prefix maps to a contiguous range
+    found with two bisections. Each term is ranked by the number of events it
+    appears in.
+    """
+
+    def __init__(self, terms: Dict[str, Tuple[str, int]], limit: int = MAX_SUGGESTIONS):
+        self.limit = limit
+        self.keys: List[str] = sorted(terms)
+        self.labels: List[str] = [terms[key][0] for key in self.keys]
+        self.counts: List[int] = [terms[key][1] for key in self.keys]
+        self.top: Dict[str, List[str]] = self._precompute_short_prefixes()
+
+    @classmethod
+    def from_events(cls, events: List[MusicEvent]) -> "SuggestIndex":
+        counts: Counter = Counter()
+        labels: Dict[str, Counter] = {}
+        for event in events:
+            # Count each term once per event, even if it appears in several fields
+            seen = set()
+            for term in [*event.get('artists', []), event.get('venue', ''), event.get('city', '')]:
+                if not isinstance(term, str):
+                    continue
+                key = _normalize(term)
+                if key in IGNORED_TERMS or key in seen:
+                    continue
+                seen.add(key)
+                counts[key] += 1
+                labels.setdefault(key, Counter())[term.strip()] += 1
+
+        # Display the most common spelling of each term
+        terms = {key: (labels[key].most_common(1)[0][0], count) for key, count in counts.items()}
+        return cls(terms)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _rank(self, lo: int, hi: int, limit: int) -> List[str]:
+        positions = heapq.nsmallest(limit, range(lo, hi), key=lambda i: (-self.counts[i], self.keys[i]))
+        return [self.labels[i] for i in positions]
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + "\U0010ffff", lo)
+        return lo, hi
+
+    def _precompute_short_prefixes(self) -> Dict[str, List[str]]:
+        prefixes = {key[:length] for key in self.keys for length in range(1, PRECOMPUTED_PREFIX_LENGTH + 1)}
+        return {prefix: self._rank(*self._range(prefix), self.limit) for prefix in prefixes}
+
+    def suggest(self, prefix: str, limit: int = MAX_SUGGESTIONS) -> List[str]:
+        """Return up to `limit` terms starting with `prefix`, most frequent first."""
+        prefix = _normalize(prefix)
+        if not prefix:
+            return []
+        limit = min(limit, self.limit)
+        if len(prefix) <= PRECOMPUTED_PREFIX_LENGTH:
+            return self.top.get(prefix, [])[:limit]
+        return self._rank(*self._range(prefix), limit)
@@ -0,0 +1,80 @@
+import base64
+import json
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from src.schema import MusicEvent
+
+
+def encode_cursor(key: Tuple[str, str]) -> str:
+    """Encode a (date, id) position as an opaque pagination cursor."""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if malformed."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    # Exactly the [date, id] pair encode_cursor writes, nothing that merely unpacks
+    if not (isinstance(key, list) and len(key) == 2 and all(isinstance(part, str) for part in key)):
+        raise ValueError("Invalid cursor: not a [date, id] position")
+    return key[0], key[1]
+
+
+class UpcomingIndex:
+    """
+    Per-city index of events sorted by date.
+
+    Each city holds a sorted array of (date, id) keys alongside the events, so a
+    date window is located with two bisections and read as a contiguous slice.
+    Keys are ISO 8601 strings, which sort chronologically; day bounds such as
+    "2025-08-15" sort before every timestamp on that day.
+    """
+
+    def __init__(self, cities: Dict[str, Tuple[List[Tuple[str, str]], List[MusicEvent]]]):
+        self.cities = cities
+
+    @classmethod
+    def from_events(cls, events: List[MusicEvent]) -> "UpcomingIndex":
+        by_city: Dict[str, List[MusicEvent]] = defaultdict(list)
+        for event in events:
+            if event.get('city') and event.get('date'):
+                by_city[event['city'].casefold()].append(event)
+
+        cities = {}
+        for city, city_events in by_city.items():
+            city_events.sort(key=lambda e: (e['date'], str(e['id'])))
+            keys = [(e['date'], str(e['id'])) for e in city_events]
+            cities[city] = (keys, city_events)
+        return cls(cities)
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys, _ in self.cities.values())
+
+    def range(self, city: str, start: str, end: str, limit: int,
+              cursor: Optional[str] = None) -> Tuple[List[MusicEvent], Optional[str]]:
+        """
+        Return events in `city` dated on or after `start` and before `end`.
+
+        Args:
+            city: City name, matched case-insensitively
+            start: Inclusive lower bound (ISO 8601 date or timestamp)
+            end: Exclusive upper bound (ISO 8601 date or timestamp)
+            limit: Maximum number of events to return
+            cursor: Cursor returned by a previous call, to continue after it
+
+        Returns:
+            The page of events and a cursor for the next page, or None when done
+        """
+        keys, events = self.cities.get(city.casefold(), ([], []))
+        lo = bisect_left(keys, (start,))
+        if cursor:
+            lo = max(lo, bisect_right(keys, decode_cursor(cursor)))
+        hi = bisect_left(keys, (end,), lo)
+
+        stop = min(lo + limit, hi)
+        next_cursor = encode_cursor(keys[stop - 1]) if stop < hi else None
+        return events[lo:stop], next_cursor
@@ -70,4 +70,52 @@ resource "aws_dynamodb_table" "posts_table" {
   tags = {
     Name = "PostsTable"
   }
-} 
\ No newline at end of file
+} 
+resource "aws_dynamodb_table" "comments_table" {
+  name           = "comments"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "id"
+
+  attribute {
+    name = "id"
+    type = "S"
+  }
+
+  attribute {
+    name = "post_id"
+    type = "S"
+  }
+
+  global_secondary_index {
+    name            = "PostIdIndex"
+    hash_key        = "post_id"
+    projection_type = "ALL"
+  }
+
+  tags = {
+    Name = "CommentsTable"
+  }
+}
+
+# One item per (liked item, user). Keeps likes idempotent without storing
+# liked_by_user_ids on the hot post/comment item itself.
+resource "aws_dynamodb_table" "likes_table" {
+  name           = "likes"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "target_id"
+  range_key      = "user_id"
+
+  attribute {
+    name = "target_id"
+    type = "S"
+  }
+
+  attribute {
+    name = "user_id"
+    type = "S"
+  }
+
+  tags = {
+    Name = "LikesTable"
+  }
+}
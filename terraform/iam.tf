@@ -59,8 +59,11 @@ resource "aws_iam_role_policy" "dynamodb_policy" {
         Resource = [
           aws_dynamodb_table.users_table.arn,
           aws_dynamodb_table.posts_table.arn,
+          aws_dynamodb_table.comments_table.arn,
+          aws_dynamodb_table.likes_table.arn,
           "${aws_dynamodb_table.users_table.arn}/index/*",
-          "${aws_dynamodb_table.posts_table.arn}/index/*"
+          "${aws_dynamodb_table.posts_table.arn}/index/*",
+          "${aws_dynamodb_table.comments_table.arn}/index/*"
         ]
       }
     ]
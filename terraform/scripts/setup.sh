@@ -15,4 +15,4 @@ export MEILI_URL="${meili_url}"
 export MEILI_API_KEY="${meili_api_key}"
 
 cd /app
-gunicorn --bind 0.0.0.0:5000 main:app 
\ No newline at end of file
+gunicorn --preload --bind 0.0.0.0:5000 main:app 
\ No newline at end of file